@@ -1,69 +1,240 @@
 import os
-import glob
 import fitz  # PyMuPDF
-import pandas as pd
 from PIL import Image
 import io
+import mmap
 import argparse
+import csv
+import multiprocessing
+import queue
 import sys
-from collections import Counter
+import threading
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from itertools import repeat
+import numpy as np
 
-def extract_pdf_statistics(pdf_path, output_dir, image_format='tiff'):
+# Optional: encode JPEGs directly with libjpeg-turbo when PyTurboJPEG is installed
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB, TJSAMP_420
+except ImportError:
+    TurboJPEG = None
+
+# Optional: stream image conversion through libvips when pyvips is installed
+try:
+    import pyvips
+except (ImportError, OSError):
+    pyvips = None
+
+# Map format string to file extension
+FORMAT_EXTENSIONS = {
+    'tiff': '.tiff',
+    'png': '.png',
+    'jpeg': '.jpg'
+}
+
+# Options used when serializing split pages. These are PyMuPDF's own
+# save()/tobytes() defaults, spelled out so the choice is explicit: the
+# page content is copied as-is from the source without garbage collection,
+# cleaning, re-deflating, pretty-printing or linearization. The output is
+# not canonicalized but renders the same as the source page.
+PAGE_SAVE_OPTIONS = {
+    'garbage': 0,
+    'clean': False,
+    'deflate': False,
+    'pretty': False,
+    'linear': False
+}
+
+# Options used with --recompress, trading time for smaller page files
+RECOMPRESS_SAVE_OPTIONS = {
+    'garbage': 3,
+    'clean': True,
+    'deflate': True,
+    'pretty': False,
+    'linear': False
+}
+
+# PDFs at least this large are memory-mapped instead of read through stdio
+MMAP_THRESHOLD = 64 * 1024 * 1024
+
+def open_pdf(pdf_path):
+    """Open a PDF, memory-mapping it if it is large.
+
+    The mapping is read-only and shared through the page cache, so worker
+    processes opening the same large file do not each read their own copy.
+    It stays alive for as long as the returned document references it.
+    """
+    if os.path.getsize(pdf_path) < MMAP_THRESHOLD:
+        return fitz.open(pdf_path)
+    with open(pdf_path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return fitz.open(stream=memoryview(mapped), filetype="pdf")
+
+# Settings shared by every page of a run, built once by make_page_options()
+PageOptions = namedtuple('PageOptions', [
+    'output_dir',
+    'image_format',
+    'image_ext',
+    'native_extensions',
+    'native_cmyk',
+    'save_image',
+    'save_fallback',
+    'recompress'
+])
+
+def make_page_options(output_dir, image_format='tiff', tiff_compression='deflate', recompress=False):
+    """Resolve the per-run page settings once instead of on every page."""
+    image_format = image_format.lower()
+    return PageOptions(
+        output_dir=output_dir,
+        image_format=image_format,
+        image_ext=FORMAT_EXTENSIONS.get(image_format, '.tiff'),
+        # Embedded image types that can be written out without re-encoding.
+        # CMYK JPEGs still need converting to RGB for JPEG output.
+        native_extensions=NATIVE_EXTENSIONS.get(image_format, ()),
+        native_cmyk=image_format != 'jpeg',
+        save_image=make_image_saver(image_format, tiff_compression),
+        # The fallback always uses Pillow, which can decode images that
+        # libvips cannot (JPEG 2000, for one)
+        save_fallback=partial(save_tiff, compression=TIFF_COMPRESSIONS.get(tiff_compression, 'tiff_deflate')),
+        recompress=recompress
+    )
+
+# Per-document values used to name and describe every page of a PDF
+DocumentInfo = namedtuple('DocumentInfo', ['original_file', 'base_filename', 'total_pages'])
+
+def describe_document(pdf_path, pdf_document):
+    """Compute the values shared by all pages of an open PDF."""
+    original_file = os.path.basename(pdf_path)
+    return DocumentInfo(
+        original_file=original_file,
+        base_filename=os.path.splitext(original_file)[0],
+        total_pages=len(pdf_document)
+    )
+
+def extract_pdf_statistics(pdf_path, output_dir, image_format='tiff', recompress=False, tiff_compression='deflate'):
     """Extract statistics from a PDF file and split it into individual pages."""
     
-    # Open the PDF
-    pdf_document = fitz.open(pdf_path)
-    total_pages = len(pdf_document)
-    base_filename = os.path.splitext(os.path.basename(pdf_path))[0]
-    
-    # Map format string to file extension
-    format_extensions = {
-        'tiff': '.tiff',
-        'png': '.png',
-        'jpeg': '.jpg'
-    }
-    ext = format_extensions.get(image_format.lower(), '.tiff')
+    options = make_page_options(output_dir, image_format, tiff_compression, recompress)
     
-    # Prepare statistics data
-    stats_data = []
+    # Open the PDF
+    pdf_document = open_pdf(pdf_path)
+    document_info = describe_document(pdf_path, pdf_document)
     
     # Process each page
-    for page_num, page in enumerate(pdf_document, 1):
-        # Create output filename for this page
-        output_filename = f"{base_filename}_{page_num}_of_{total_pages}.pdf"
-        output_path = os.path.join(output_dir, output_filename)
-        
-        # Extract the page as a new PDF
-        new_pdf = fitz.open()
-        new_pdf.insert_pdf(pdf_document, from_page=page_num-1, to_page=page_num-1)
-        new_pdf.save(output_path)
-        new_pdf.close()
-        
-        # Get page statistics
-        page_stats = get_page_statistics(page, pdf_document, page_num-1)
-        page_stats["Original File"] = os.path.basename(pdf_path)
-        page_stats["Output File"] = output_filename
-        page_stats["Page Number"] = page_num
-        page_stats["Total Pages"] = total_pages
-        page_stats["File Size (KB)"] = os.path.getsize(output_path) / 1024
-        
-        # Extract text from the page
-        page_stats["Page Text"] = extract_page_text(page)
-        
-        # Extract largest image if available
-        if page_stats["Raster Count"] > 0:
-            img_filename = f"{base_filename}_{page_num}_of_{total_pages}_largest_image{ext}"
-            img_path = os.path.join(output_dir, img_filename)
-            extract_largest_image(page, img_path, image_format)
-            page_stats["Largest Image File"] = img_filename
-        else:
-            page_stats["Largest Image File"] = "N/A"
-        
-        stats_data.append(page_stats)
+    stats_data = [process_page(pdf_document, document_info, page_index, options)
+                  for page_index in range(document_info.total_pages)]
     
     pdf_document.close()
     return stats_data
 
+# Number of open documents each worker process keeps for reuse
+DOCUMENT_CACHE_SIZE = 4
+
+@lru_cache(maxsize=DOCUMENT_CACHE_SIZE)
+def get_cached_document(pdf_path):
+    """Open a PDF once per worker process and reuse it for its later pages.
+
+    Returns the document together with its DocumentInfo. Documents dropped
+    from the cache are closed when garbage collected.
+    """
+    pdf_document = open_pdf(pdf_path)
+    return pdf_document, describe_document(pdf_path, pdf_document)
+
+# Queue that worker processes send finished rows to, set by init_worker()
+ROW_QUEUE = None
+
+def init_worker(row_queue=None):
+    """Start a worker process with an empty document cache.
+
+    If ``row_queue`` is given, process_one_page() sends its rows there
+    instead of returning them.
+    """
+    global ROW_QUEUE
+    ROW_QUEUE = row_queue
+    get_cached_document.cache_clear()
+
+def process_one_page(pdf_path, page_index, options):
+    """Process a single page of a PDF in a worker process.
+
+    This is the unit of work handed to worker processes, so that the pages
+    of one large PDF can be spread across processes. The PDF is parsed
+    once per worker and kept open for the pages that follow. When the worker
+    has a row queue, the page's statistics are put on it and True is
+    returned. Otherwise the statistics are returned. Errors are reported and
+    None is returned so that one bad page does not stop the others.
+    """
+    try:
+        pdf_document, document_info = get_cached_document(pdf_path)
+        page_stats = process_page(pdf_document, document_info, page_index, options)
+        if ROW_QUEUE is None:
+            return page_stats
+        ROW_QUEUE.put(page_stats)
+        return True
+    except Exception as e:
+        print(f"Error processing {pdf_path} page {page_index + 1}: {e}")
+        return None
+
+def process_page(pdf_document, document_info, page_index, options):
+    """Split one page of an open PDF into its own file and gather its statistics.
+
+    ``document_info`` comes from describe_document() and ``options`` from
+    make_page_options(). With ``options.recompress`` the page file is
+    garbage collected, cleaned and deflated on save, which is slower but
+    gives smaller files.
+    """
+    page = pdf_document[page_index]
+    page_num = page_index + 1
+    
+    # Create output filename for this page
+    page_prefix = f"{document_info.base_filename}_{page_num}_of_{document_info.total_pages}"
+    output_filename = f"{page_prefix}.pdf"
+    output_path = os.path.join(options.output_dir, output_filename)
+    
+    # Extract the page as a new PDF. insert_pdf() copies only the objects the
+    # page references; select() on a copy of the source would keep every
+    # object of the original file unless garbage collection is run on save.
+    # A fresh destination is used for every page for the same reason: after
+    # delete_page() a reused one still carries the previous pages' objects.
+    new_pdf = fitz.open()
+    new_pdf.insert_pdf(pdf_document, from_page=page_index, to_page=page_index)
+    # Saving straight to the path is faster than tobytes() followed by a
+    # separate write of the buffer
+    new_pdf.save(output_path, **(RECOMPRESS_SAVE_OPTIONS if options.recompress else PAGE_SAVE_OPTIONS))
+    new_pdf.close()
+    
+    # List the page's images once for both the statistics and image extraction
+    images = page.get_images(full=True)
+    
+    # Get page statistics
+    page_stats = get_page_statistics(page, pdf_document, page_index, images)
+    page_stats["Original File"] = document_info.original_file
+    page_stats["Output File"] = output_filename
+    page_stats["Page Number"] = page_num
+    page_stats["Total Pages"] = document_info.total_pages
+    page_stats["File Size (KB)"] = os.stat(output_path).st_size / 1024
+    
+    # Extract text from the page
+    page_stats["Page Text"] = extract_page_text(page)
+    
+    # Extract largest image if available
+    if page_stats["Raster Count"] > 0:
+        img_filename = f"{page_prefix}_largest_image{options.image_ext}"
+        img_path = os.path.join(options.output_dir, img_filename)
+        extract_largest_image(page, img_path, options.image_format, images, options)
+        page_stats["Largest Image File"] = img_filename
+    else:
+        page_stats["Largest Image File"] = "N/A"
+    
+    return page_stats
+
+def write_file(path, data):
+    """Write a complete in-memory file to disk in one call."""
+    with open(path, "wb") as f:
+        f.write(data)
+
 def extract_page_text(page):
     """Extract all text from a PDF page."""
     try:
@@ -75,8 +246,11 @@ def extract_page_text(page):
         print(f"Warning: Failed to extract text: {e}")
         return ""
 
-def get_page_statistics(page, pdf_document, page_index):
-    """Get statistics for a specific page including vector objects and colors."""
+def get_page_statistics(page, pdf_document, page_index, images=None):
+    """Get statistics for a specific page including vector objects and colors.
+
+    ``images`` may be passed in if the caller has already listed the page's images.
+    """
     stats = {
         "Point Count": 0,
         "Line Count": 0,
@@ -88,28 +262,25 @@ def get_page_statistics(page, pdf_document, page_index):
     # Get page dictionary
     xref = pdf_document.xref_object(page.xref)
     
-    # Extract vector graphics (approximate counts)
-    paths = page.get_drawings()
+    # Extract vector graphics (approximate counts). get_cdrawings() returns the
+    # same paths as get_drawings() without building Point/Rect objects for
+    # every item, which dominates on pages with many vector items.
+    paths = page.get_cdrawings()
+    opcodes = Counter(item[0] for path in paths for item in path.get("items", ()))
+    stats["Line Count"] = opcodes["l"]  # Lines
+    stats["Polygon Count"] = opcodes["re"] + opcodes["c"] + opcodes["v"] + opcodes["y"]  # Rectangles and curves
+    stats["Point Count"] = opcodes["m"]  # Moves (could be points)
+    
+    # Extract colors used in vectors (dict keeps first-seen order)
+    colors = {}
     for path in paths:
-        if "items" in path:
-            for item in path["items"]:
-                if item[0] == "l":  # Line
-                    stats["Line Count"] += 1
-                elif item[0] == "re":  # Rectangle (polygon)
-                    stats["Polygon Count"] += 1
-                elif item[0] == "c" or item[0] == "v" or item[0] == "y":  # Curves (polygons)
-                    stats["Polygon Count"] += 1
-                elif item[0] == "m":  # Move (could be point)
-                    stats["Point Count"] += 1
-        
-        # Extract colors used in vectors
-        if "color" in path and path["color"]:
-            color_str = str(path["color"])
-            if color_str not in stats["Vector Colors"]:
-                stats["Vector Colors"].append(color_str)
+        if path.get("color"):
+            colors[str(path["color"])] = None
+    stats["Vector Colors"] = list(colors)
     
     # Count raster images
-    images = page.get_images(full=True)
+    if images is None:
+        images = page.get_images(full=True)
     stats["Raster Count"] = len(images)
     
     # Convert colors list to string
@@ -117,75 +288,306 @@ def get_page_statistics(page, pdf_document, page_index):
     
     return stats
 
-def extract_largest_image(page, output_path, image_format='tiff'):
-    """Extract the largest image from a page and save it in the specified format."""
-    largest_img = None
-    max_size = 0
+# Extensions reported by PyMuPDF's extract_image() for each output format
+NATIVE_EXTENSIONS = {
+    'tiff': ('tif', 'tiff'),
+    'png': ('png',),
+    'jpeg': ('jpeg', 'jpg')
+}
+
+def is_native_format(base_image, options):
+    """Check whether an extracted image can be written out without re-encoding.
+
+    ``options`` are the run's settings from make_page_options().
+    """
+    if base_image.get("ext") not in options.native_extensions:
+        return False
+    return options.native_cmyk or base_image.get("colorspace") != 4
+
+# Colour spaces whose JPEG streams can be used exactly as stored, with
+# their component counts
+RAW_JPEG_COLORSPACES = {
+    'DeviceGray': 1,
+    'DeviceRGB': 3
+}
+
+def read_raw_jpeg(pdf_document, img, raw):
+    """Return extract_image()-style data for a plain JPEG image stream, or None.
+
+    A stream whose only filter is DCTDecode is already a complete JPEG file,
+    so the raw bytes can be used directly instead of asking MuPDF to load
+    the image again. Anything that could change the colours (other colour
+    spaces, a Decode array) is left to extract_image().
+    """
+    xref, colorspace = img[0], img[5]
+    if colorspace not in RAW_JPEG_COLORSPACES or not raw:
+        return None
+    if pdf_document.xref_get_key(xref, "Filter") != ("name", "/DCTDecode"):
+        return None
+    if pdf_document.xref_get_key(xref, "Decode")[0] != "null":
+        return None
+    return {
+        "ext": "jpeg",
+        "image": raw,
+        "colorspace": RAW_JPEG_COLORSPACES[colorspace],
+        "width": img[2],
+        "height": img[3]
+    }
+
+def find_largest_image(pdf_document, images):
+    """Return the extract_image() dictionary of the largest image in a list of page images."""
+    # Rank images by their raw (still encoded) stream size so only the
+    # chosen one has to be decoded by MuPDF
+    try:
+        largest, largest_raw = None, b""
+        for img in images:
+            raw = pdf_document.xref_stream_raw(img[0]) or b""
+            if largest is None or len(raw) > len(largest_raw):
+                largest, largest_raw = img, raw
+        if largest is not None:
+            return read_raw_jpeg(pdf_document, largest, largest_raw) or pdf_document.extract_image(largest[0])
+    except Exception as e:
+        print(f"Warning: Failed to read raw image streams, decoding all images instead: {e}")
     
-    for img_index, img in enumerate(page.get_images(full=True)):
+    # Fallback: decode every image and compare the extracted bytes
+    largest_image = None
+    max_size = 0
+    for img in images:
         xref = img[0]
         try:
-            base_image = page.parent.extract_image(xref)
-            image_bytes = base_image["image"]
+            base_image = pdf_document.extract_image(xref)
             
             # Get image size
-            img_size = len(image_bytes)
+            img_size = len(base_image["image"])
             if img_size > max_size:
                 max_size = img_size
-                largest_img = image_bytes
+                largest_image = base_image
         except Exception as e:
             print(f"Warning: Failed to extract image: {e}")
     
+    return largest_image
+
+@lru_cache(maxsize=None)
+def get_turbo_jpeg():
+    """Return a shared TurboJPEG encoder, or None if libjpeg-turbo is not available."""
+    if TurboJPEG is None:
+        return None
+    try:
+        return TurboJPEG()
+    except Exception as e:
+        print(f"Warning: libjpeg-turbo not available, using Pillow for JPEG: {e}")
+        return None
+
+def to_rgb_array(img):
+    """Convert a Pillow image to an RGB uint8 array, compositing any alpha over white."""
+    if img.mode in ('RGBA', 'LA'):
+        arr = np.asarray(img.convert('RGBA'))
+        # Integer blend with white, rounded: (c * a + 255 * (255 - a)) / 255
+        alpha = arr[..., 3:4].astype(np.uint16)
+        rgb = (arr[..., :3] * alpha + 255 * (255 - alpha) + 127) // 255
+        return rgb.astype(np.uint8)
+    return np.asarray(img.convert('RGB'))
+
+def save_jpeg(image_bytes, output_path):
+    """Encode an image as JPEG, flattening any alpha channel onto white."""
+    img = Image.open(io.BytesIO(image_bytes))
+    
+    turbo_jpeg = get_turbo_jpeg()
+    if turbo_jpeg is not None:
+        # Encode with libjpeg-turbo
+        write_file(output_path, turbo_jpeg.encode(to_rgb_array(img), quality=90,
+                                                  pixel_format=TJPF_RGB,
+                                                  jpeg_subsample=TJSAMP_420))
+        return
+    
+    # JPEG needs RGB mode (no alpha)
+    if img.mode in ('RGBA', 'LA'):
+        # Composite onto a white background in one pass over the pixels
+        img = Image.fromarray(to_rgb_array(img))
+    elif img.mode != 'RGB':
+        img = img.convert('RGB')
+    
+    img.save(output_path, "JPEG", quality=90)
+
+def save_png(image_bytes, output_path):
+    """Encode an image as PNG."""
+    # PNG can handle all modes including transparency
+    Image.open(io.BytesIO(image_bytes)).save(output_path, "PNG")
+
+def save_tiff(image_bytes, output_path, compression='tiff_deflate'):
+    """Encode an image as TIFF with the given Pillow compression."""
+    # TIFF can handle all modes including transparency
+    Image.open(io.BytesIO(image_bytes)).save(output_path, "TIFF", compression=compression)
+
+# The libvips savers hand images libvips cannot load (JPEG 2000, for one)
+# to the matching Pillow saver
+
+def vips_save_jpeg(image_bytes, output_path):
+    """Encode an image as JPEG with libvips, flattening any alpha channel onto white."""
+    try:
+        # Sequential access lets libvips decode, convert and encode in strips
+        # without holding the whole raster in memory
+        image = pyvips.Image.new_from_buffer(image_bytes, "", access="sequential")
+        if image.hasalpha():
+            image = image.flatten(background=255)
+        if image.interpretation != "srgb":
+            image = image.colourspace("srgb")
+        image.jpegsave(output_path, Q=90, subsample_mode="on")
+    except pyvips.Error:
+        save_jpeg(image_bytes, output_path)
+
+def vips_save_png(image_bytes, output_path):
+    """Encode an image as PNG with libvips."""
+    try:
+        pyvips.Image.new_from_buffer(image_bytes, "", access="sequential").pngsave(output_path)
+    except pyvips.Error:
+        save_png(image_bytes, output_path)
+
+def vips_save_tiff(image_bytes, output_path, compression='deflate'):
+    """Encode an image as TIFF with libvips and the given libvips compression."""
+    try:
+        image = pyvips.Image.new_from_buffer(image_bytes, "", access="sequential")
+        image.tiffsave(output_path, compression=compression)
+    except pyvips.Error:
+        save_tiff(image_bytes, output_path, TIFF_COMPRESSIONS.get(compression, 'tiff_deflate'))
+
+# Pillow compression names for the --tiff-compression choices
+TIFF_COMPRESSIONS = {
+    'deflate': 'tiff_deflate',
+    'lzw': 'tiff_lzw'
+}
+
+def make_image_saver(image_format='tiff', tiff_compression='deflate'):
+    """Pick the image encoder for a run once, rather than on every page.
+
+    Returns a ``save(image_bytes, output_path)`` callable. It is a plain
+    module-level function or a partial of one, so it can be sent to worker
+    processes. libvips is used when pyvips is installed, Pillow otherwise.
+    """
+    image_format = image_format.lower()
+    if pyvips is not None:
+        if image_format == 'jpeg':
+            return vips_save_jpeg
+        if image_format == 'png':
+            return vips_save_png
+        # libvips uses the same compression names as the command line
+        return partial(vips_save_tiff, compression=tiff_compression)
+    
+    if image_format == 'jpeg':
+        return save_jpeg
+    if image_format == 'png':
+        return save_png
+    return partial(save_tiff, compression=TIFF_COMPRESSIONS.get(tiff_compression, 'tiff_deflate'))
+
+def extract_largest_image(page, output_path, image_format='tiff', images=None, options=None):
+    """Extract the largest image from a page and save it in the specified format.
+
+    ``images`` may be passed in if the caller has already listed the page's images.
+    ``options`` are the run's settings from make_page_options(), which
+    supply the encoder and the TIFF fallback; they are built from
+    ``image_format`` when not given.
+    """
+    if images is None:
+        images = page.get_images(full=True)
+    if options is None:
+        options = make_page_options(os.path.dirname(output_path), image_format)
+    largest_image = find_largest_image(page.parent, images)
+    largest_img = largest_image["image"] if largest_image else None
+    
     if largest_img:
+        # If the embedded image is already in the requested format, write the
+        # bytes as-is instead of decoding and re-encoding them
+        if is_native_format(largest_image, options):
+            try:
+                write_file(output_path, largest_img)
+                print(f"Saved image to {output_path}")
+                return
+            except Exception as e:
+                print(f"Warning: Failed to write image bytes directly: {e}")
+        
         try:
             # Save the largest image
-            img = Image.open(io.BytesIO(largest_img))
-            
-            # Convert image mode based on target format
-            if image_format.lower() == 'jpeg':
-                # JPEG needs RGB mode (no alpha)
-                if img.mode in ('RGBA', 'LA'):
-                    # Create a white background
-                    background = Image.new('RGB', img.size, (255, 255, 255))
-                    # Paste the image on the background using alpha as mask
-                    if 'A' in img.mode:  # Has alpha channel
-                        background.paste(img, mask=img.split()[3])  # 3 is the alpha channel
-                    else:
-                        background.paste(img)
-                    img = background
-                elif img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                img.save(output_path, "JPEG", quality=90)
-            
-            elif image_format.lower() == 'png':
-                # PNG can handle all modes including transparency
-                img.save(output_path, "PNG")
-            
-            else:  # default to TIFF
-                # TIFF can handle all modes including transparency
-                img.save(output_path, "TIFF", compression="tiff_lzw")
-            
+            options.save_image(largest_img, output_path)
             print(f"Saved image to {output_path}")
             
         except Exception as e:
-            print(f"Warning: Failed to save image as {image_format}: {e}")
+            print(f"Warning: Failed to save image as {options.image_format}: {e}")
             # Try to save as TIFF as fallback (most versatile format)
             try:
                 tiff_path = os.path.splitext(output_path)[0] + '.tiff'
-                img = Image.open(io.BytesIO(largest_img))
-                img.save(tiff_path, "TIFF", compression="tiff_lzw")
+                options.save_fallback(largest_img, tiff_path)
                 print(f"Saved image as TIFF instead: {tiff_path}")
             except Exception as e2:
                 print(f"Error: Could not save image in any format: {e2}")
 
-def process_all_pdfs(input_dir, output_dir, image_format):
-    """Process all PDF files in a directory and create statistics CSV."""
+# Columns of the statistics CSV, in output order
+CSV_FIELDS = [
+    "Point Count",
+    "Line Count",
+    "Polygon Count",
+    "Raster Count",
+    "Vector Colors",
+    "Original File",
+    "Output File",
+    "Page Number",
+    "Total Pages",
+    "File Size (KB)",
+    "Page Text",
+    "Largest Image File"
+]
+
+# Excel has ~32K character limit per cell
+MAX_TEXT_LENGTH = 32000
+
+def write_stats_row(writer, page_stats):
+    """Write one page's statistics to the CSV, truncating extremely long text."""
+    text = page_stats.get("Page Text", "")
+    if len(text) > MAX_TEXT_LENGTH:
+        page_stats["Page Text"] = text[:MAX_TEXT_LENGTH] + "..."
+    writer.writerow(page_stats)
+
+def write_queued_rows(row_queue, writer, state):
+    """Write rows from worker processes to the CSV until a None sentinel arrives.
+
+    ``state["rows"]`` counts the rows written. If writing fails, the
+    exception is stored in ``state["error"]`` and the remaining rows are
+    drained and dropped, so workers never block on a full queue.
+    """
+    while (page_stats := row_queue.get()) is not None:
+        if state["error"] is not None:
+            continue
+        try:
+            write_stats_row(writer, page_stats)
+            state["rows"] += 1
+        except Exception as e:
+            state["error"] = e
+
+def find_pdf_files(input_dir):
+    """List the PDF files in a directory, largest first.
+
+    Starting the biggest files first keeps the worker pool from finishing
+    with a single large PDF still running on its own. Hidden files (such as
+    macOS "._name.pdf" metadata files) are skipped, as glob("*.pdf") did.
+    """
+    entries = [entry for entry in os.scandir(input_dir)
+               if entry.is_file() and entry.name.endswith(".pdf")
+               and not entry.name.startswith(".")]
+    entries.sort(key=lambda entry: entry.stat().st_size, reverse=True)
+    return [entry.path for entry in entries]
+
+def process_all_pdfs(input_dir, output_dir, image_format, threads=None, tiff_compression='deflate', recompress=False):
+    """Process all PDF files in a directory and create statistics CSV.
+
+    Every page of every PDF is processed as a separate task in a pool of
+    worker processes; ``threads`` sets the number of workers (defaults to
+    the number of CPUs). Workers send rows through a queue to a writer
+    thread, so the CSV is written while pages are still being processed,
+    in the order the pages finish.
+    """
     # Ensure output directory exists
     os.makedirs(output_dir, exist_ok=True)
     
-    pdf_files = glob.glob(os.path.join(input_dir, "*.pdf"))
-    all_stats = []
+    pdf_files = find_pdf_files(input_dir)
     
     if not pdf_files:
         print(f"No PDF files found in {input_dir}")
@@ -193,33 +595,106 @@ def process_all_pdfs(input_dir, output_dir, image_format):
     
     print(f"Using image format: {image_format}")
     
+    # Build one task per page so large single PDFs are split across workers too
+    tasks = []
     for pdf_file in pdf_files:
         print(f"Processing {pdf_file}...")
         try:
-            stats = extract_pdf_statistics(pdf_file, output_dir, image_format)
-            all_stats.extend(stats)
+            pdf_document = open_pdf(pdf_file)
+            page_count = len(pdf_document)
+            pdf_document.close()
         except Exception as e:
             print(f"Error processing {pdf_file}: {e}")
+            continue
+        tasks.extend((pdf_file, page_index) for page_index in range(page_count))
     
-    # Create and save statistics CSV
-    if all_stats:
-        stats_df = pd.DataFrame(all_stats)
-        csv_path = os.path.join(output_dir, "pdf_statistics.csv")
-        
-        # Check for extremely large text that might cause issues in CSV
-        if "Page Text" in stats_df.columns:
-            # Truncate extremely long text to avoid CSV issues
-            max_text_length = 32000  # Excel has ~32K character limit per cell
-            stats_df["Page Text"] = stats_df["Page Text"].apply(
-                lambda x: (x[:max_text_length] + "...") if len(x) > max_text_length else x
-            )
-        
-        stats_df.to_csv(csv_path, index=False, encoding='utf-8')
+    csv_path = os.path.join(output_dir, "pdf_statistics.csv")
+    total_rows = write_statistics_csv(csv_path, tasks, output_dir, image_format, threads,
+                                      tiff_compression, recompress)
+    
+    if total_rows:
         print(f"Statistics saved to {csv_path}")
-        print(f"Processed {len(pdf_files)} PDF files with a total of {len(all_stats)} pages")
+        print(f"Processed {len(pdf_files)} PDF files with a total of {total_rows} pages")
     else:
+        os.remove(csv_path)
         print("No statistics were collected. Check for errors above.")
 
+# Seconds to wait for the CSV writer thread to accept its stop sentinel
+SENTINEL_TIMEOUT = 60
+
+def write_statistics_csv(csv_path, tasks, output_dir, image_format, threads=None,
+                         tiff_compression='deflate', recompress=False):
+    """Process (pdf_path, page_index) tasks in worker processes and write the CSV.
+
+    Returns the number of rows written. An error from the CSV writer stops
+    the run and is re-raised; the partial CSV is removed on any failure.
+    """
+    csv_file = open(csv_path, "w", newline="", encoding="utf-8")
+    try:
+        with csv_file:
+            # Keep the "\n" line endings the pandas-written CSV had
+            writer = csv.DictWriter(csv_file, fieldnames=CSV_FIELDS, lineterminator="\n")
+            writer.writeheader()
+        
+            # Rows go straight from the workers to a writer thread, which keeps
+            # the disk writes off the path that collects task results
+            row_queue = multiprocessing.Queue(maxsize=1024)
+            write_state = {"rows": 0, "error": None}
+            # A daemon thread, so a writer stuck past the join timeout below
+            # cannot keep the interpreter from exiting
+            writer_thread = threading.Thread(target=write_queued_rows, args=(row_queue, writer, write_state),
+                                             daemon=True)
+            writer_thread.start()
+        
+            # Pages are independent, so hand them to separate processes. Processes
+            # (rather than threads) keep PyMuPDF document handles out of each other's
+            # way and let the rendering/encoding work use every core.
+            workers = threads or os.cpu_count() or 1
+            chunksize = max(1, len(tasks) // (workers * 4))
+            options = make_page_options(output_dir, image_format, tiff_compression, recompress)
+            try:
+                with ProcessPoolExecutor(max_workers=threads, initializer=init_worker,
+                                         initargs=(row_queue,)) as executor:
+                    results = executor.map(process_one_page,
+                                           [pdf_file for pdf_file, _ in tasks],
+                                           [page_index for _, page_index in tasks],
+                                           repeat(options),
+                                           chunksize=chunksize)
+                    for _ in results:
+                        # Stop handing out pages once rows can no longer be written.
+                        # Pages already running finish while the writer drains them.
+                        if write_state["error"] is not None or not writer_thread.is_alive():
+                            executor.shutdown(wait=True, cancel_futures=True)
+                            break
+            finally:
+                # All workers have exited, so every row is already in the queue.
+                # The writer keeps draining until the sentinel, so the put only
+                # waits if the thread has died.
+                try:
+                    row_queue.put(None, timeout=SENTINEL_TIMEOUT)
+                except queue.Full:
+                    pass
+                writer_thread.join(timeout=SENTINEL_TIMEOUT)
+    
+        if write_state["error"] is not None:
+            raise write_state["error"]
+        if writer_thread.is_alive():
+            raise RuntimeError("CSV writer thread did not finish")
+    except BaseException:
+        # Don't leave a partial CSV behind when the run is aborted. The file
+        # is only removed once open() has succeeded, so an existing file that
+        # could not be opened is never touched.
+        os.remove(csv_path)
+        raise
+    return write_state["rows"]
+
+def positive_int(value):
+    """Argument type for integers of at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
 def parse_arguments():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description='Process PDF files: split pages, extract images, and gather statistics')
@@ -227,6 +702,12 @@ def parse_arguments():
     parser.add_argument('-o', '--output', required=True, help='Output directory for processed files')
     parser.add_argument('-f', '--format', choices=['tiff', 'png', 'jpeg'], default='tiff', 
                         help='Format for extracted images (default: tiff)')
+    parser.add_argument('--tiff-compression', choices=list(TIFF_COMPRESSIONS), default='deflate',
+                        help='Compression for TIFF images; lzw is slower but readable by older tools (default: deflate)')
+    parser.add_argument('--recompress', action='store_true',
+                        help='Garbage collect and deflate split page PDFs for smaller files (slower)')
+    parser.add_argument('-t', '--threads', type=positive_int, default=None,
+                        help='Number of worker processes (default: number of CPUs)')
     
     return parser.parse_args()
 
@@ -241,4 +722,5 @@ if __name__ == "__main__":
     print(f"Processing PDFs from: {args.input}")
     print(f"Saving output to: {args.output}")
     
-    process_all_pdfs(args.input, args.output, args.format)
\ No newline at end of file
+    process_all_pdfs(args.input, args.output, args.format, args.threads, args.tiff_compression,
+                     args.recompress)
\ No newline at end of file